@@ -0,0 +1,260 @@
+"""
+On-disk cache of parsed csv files, stored as uncompressed feather files
+"""
+
+import collections
+import hashlib
+import os
+
+
+class FileCache(object):
+
+    """
+    Size-limited cache of parsed DataFrames, keyed on the source file.
+
+    Each cached DataFrame is stored as an uncompressed feather (Arrow IPC)
+    file, which is much faster to load than re-parsing the csv file.
+    Once the cache grows beyond `max_size` bytes the least recently used
+    files are removed.
+
+    The size and order of use of the cached files is tracked in memory, and
+    is re-read from the cache directory when the cache is created and then
+    every `rescan_every` writes, using file modification times to order files
+    from previous sessions or other processes. If several processes share a
+    cache directory, files written by the others are only counted towards
+    `max_size` at the next re-read, so the cache can briefly grow past
+    `max_size`.
+
+    Methods
+    -------
+    key :
+        creates a cache key from a source file and the options used to read it
+    get :
+        loads a cached DataFrame, returns None if not cached
+    put :
+        stores a DataFrame in the cache
+    evict :
+        removes least recently used files until the cache fits in `max_size`
+    clear :
+        removes all cached files
+    """
+
+    suffix = ".feather"
+    rescan_every = 100
+
+    def __init__(self, location, max_size=None):
+        """
+        Parameters:
+        -----------
+        location : string
+            path to the directory in which cached files are stored, this will
+            be created if it doesn't already exist.
+        max_size : int or None (default=None)
+            maximum total size of the cache in bytes. If None then the cache
+            size is unlimited.
+
+        Returns:
+        --------
+        Nothing
+        """
+        try:
+            from pyarrow import feather
+            from pyarrow.lib import ArrowException
+        except ImportError:
+            raise ImportError("pyarrow is required to use a file cache")
+        self._feather = feather
+        # errors raised when a DataFrame can't be stored as a feather file,
+        # e.g. mixed-type object columns, duplicate column names or a full
+        # disk
+        self.write_errors = (ArrowException, ValueError, TypeError, OSError)
+        # errors raised when a cached file can't be read back
+        self.read_errors = (ArrowException, ValueError, OSError)
+        if not os.path.isdir(location):
+            os.makedirs(location)
+        self.location = location
+        self.max_size = max_size
+        self._scan()
+
+    @staticmethod
+    def key(file_path, header=0, **kwargs):
+        """
+        Create a cache key for a source file. The key changes if the file is
+        modified, or if it is read with different options.
+
+        Parameters:
+        -----------
+        file_path : string
+            path to the source csv file
+        header : int or list
+            the header rows used when reading the file
+        **kwargs : additional arguments used when reading the file
+
+        Returns:
+        --------
+        string, or None if the options can't be used as a key which is
+        the same between sessions, i.e. they contain functions.
+        """
+        for value in kwargs.values():
+            if isinstance(value, dict):
+                values = list(value.values())
+            elif isinstance(value, (list, tuple)):
+                values = list(value)
+            else:
+                values = [value]
+            # the repr of a function changes between sessions
+            if any(callable(v) for v in values):
+                return None
+        stat = os.stat(file_path)
+        key_parts = [
+            os.path.abspath(file_path),
+            stat.st_size,
+            stat.st_mtime_ns,
+            header,
+            sorted(kwargs.items()),
+        ]
+        return hashlib.sha1(repr(key_parts).encode("utf-8")).hexdigest()
+
+    def get(self, key):
+        """
+        Load a cached DataFrame.
+
+        Parameters:
+        -----------
+        key : string
+            cache key, as returned by `key()`
+
+        Returns:
+        --------
+        pandas.DataFrame, or None if `key` is not in the cache or the cached
+        file can't be read
+        """
+        if key not in self._index:
+            return None
+        cache_path = self._cache_path(key)
+        try:
+            dataframe = self._feather.read_feather(cache_path)
+        except self.read_errors:
+            # removed from outside of this cache, or corrupt
+            self._size -= self._index.pop(key)
+            try:
+                os.remove(cache_path)
+            except OSError:
+                pass
+            return None
+        # mark as recently used, both here and for later sessions
+        self._index.move_to_end(key)
+        try:
+            os.utime(cache_path, None)
+        except OSError:
+            # e.g. a read-only shared cache
+            pass
+        return dataframe
+
+    def put(self, key, dataframe):
+        """
+        Store a DataFrame in the cache, evicting older files if the cache
+        exceeds `max_size`. DataFrames larger than `max_size` are not stored.
+
+        Parameters:
+        -----------
+        key : string
+            cache key, as returned by `key()`
+        dataframe : pandas.DataFrame
+            DataFrame with string column names and a default index
+
+        Returns:
+        --------
+        Nothing
+        """
+        if (
+            self.max_size is not None
+            and dataframe.memory_usage(deep=True).sum() > self.max_size
+        ):
+            # would be evicted straight away
+            return
+        cache_path = self._cache_path(key)
+        # write to a temporary file first so a partially written file is
+        # never read back from the cache
+        tmp_path = "{}.tmp".format(cache_path)
+        try:
+            self._feather.write_feather(
+                dataframe, tmp_path, compression="uncompressed"
+            )
+            os.replace(tmp_path, cache_path)
+        finally:
+            if os.path.isfile(tmp_path):
+                os.remove(tmp_path)
+        self._size -= self._index.pop(key, 0)
+        self._index[key] = os.path.getsize(cache_path)
+        self._size += self._index[key]
+        self._puts_since_scan += 1
+        if self._puts_since_scan >= self.rescan_every:
+            # pick up files written by other processes
+            self._scan()
+        self.evict()
+
+    def evict(self):
+        """
+        Remove least recently used files until the total size of the cache
+        is no larger than `max_size`.
+
+        Returns:
+        --------
+        Nothing
+        """
+        if self.max_size is None:
+            return
+        while self._size > self.max_size and self._index:
+            key, size = self._index.popitem(last=False)
+            cache_path = self._cache_path(key)
+            try:
+                os.remove(cache_path)
+            except OSError:
+                # already removed by another process
+                pass
+            self._size -= size
+
+    def clear(self):
+        """
+        Remove all cached files, including any temporary files left by an
+        interrupted write.
+
+        Returns:
+        --------
+        Nothing
+        """
+        for f in os.listdir(self.location):
+            if f.endswith((self.suffix, "{}.tmp".format(self.suffix))):
+                os.remove(os.path.join(self.location, f))
+        self._scan()
+
+    def _scan(self):
+        """
+        (Re-)build the index of cached files from the cache directory
+        """
+        # cache key => file size, ordered from least to most recently used
+        self._index = collections.OrderedDict()
+        self._size = 0
+        self._puts_since_scan = 0
+        cached = []
+        for cache_path in self._cache_paths():
+            try:
+                stat = os.stat(cache_path)
+            except OSError:
+                # removed by another process
+                continue
+            cached.append((stat.st_mtime, stat.st_size, cache_path))
+        for _, size, cache_path in sorted(cached):
+            key = os.path.basename(cache_path)[: -len(self.suffix)]
+            self._index[key] = size
+            self._size += size
+
+    def _cache_path(self, key):
+        return os.path.join(self.location, "{}{}".format(key, self.suffix))
+
+    def _cache_paths(self):
+        return [
+            os.path.join(self.location, f)
+            for f in os.listdir(self.location)
+            if f.endswith(self.suffix)
+        ]
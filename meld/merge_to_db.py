@@ -7,6 +7,7 @@ import sys
 import warnings
 import pandas as pd
 import sqlalchemy
+from meld import cache
 from meld import colfuncs
 from meld import utils
 
@@ -26,9 +27,13 @@ class Merger(object):
         sqlite database created by create_db
     to_db_agg :
         like to_db, but aggregates the data on a specified column
+    to_csv_agg :
+        like to_db_agg, but writes the aggregated data to a csv file
+    read_file :
+        reads a single csv file, using the file cache if one was given
     """
 
-    def __init__(self, directory):
+    def __init__(self, directory, cache_dir=None, cache_size=None):
         """
         Get full filepaths of all files in a directory, including
         sub-directories.
@@ -37,6 +42,16 @@ class Merger(object):
         ------------
         directory: string
             Path to results directory containing sub-directories of results
+        cache_dir: string or None (default=None)
+            Path to a directory in which to cache parsed files, so that
+            re-running the `to_db*()` and `to_csv_agg()` methods doesn't have
+            to parse the .csv files again. Requires pyarrow.
+            If None then files are not cached.
+        cache_size: int or None (default=None)
+            Maximum size of the cache in bytes, least recently used files
+            are removed once this is exceeded. If None the cache size is
+            unlimited. Files written to the same `cache_dir` by other
+            processes are only counted periodically, see meld.cache.FileCache.
 
         Returns:
         ---------
@@ -54,6 +69,10 @@ class Merger(object):
             raise RuntimeError("{} does not contain any files".format(directory))
         self.db_handle = None
         self.engine = None
+        if cache_dir is None:
+            self.cache = None
+        else:
+            self.cache = cache.FileCache(cache_dir, max_size=cache_size)
 
     def create_db(self, location, db_name="results"):
         """
@@ -119,33 +138,10 @@ class Merger(object):
         if len(file_paths) == 0:
             raise ValueError("No files found matching '{}'".format(file_name))
         for indv_file in file_paths:
-            if header == 0 or header == [0]:
-                # dont need to collapse headers
-                tmp_file = pd.read_csv(
-                    indv_file, header=0, chunksize=10000, iterator=True, **kwargs
-                )
-                all_file = pd.concat(tmp_file)
-                all_file.to_sql(
-                    table_name, con=self.engine, index=False, if_exists="append"
-                )
-            else:
-                # have to collapse columns
-                tmp_file = pd.read_csv(
-                    indv_file, header=header, chunksize=10000, iterator=True, **kwargs
-                )
-                all_file = pd.concat(tmp_file)
-                # collapse column names if multi-indexed
-                if isinstance(all_file.columns, pd.core.index.MultiIndex):
-                    all_file.columns = colfuncs.collapse_cols(all_file)
-                else:
-                    raise HeaderError(
-                        "Multiple headers selected, yet dataframe is not "
-                        + "multi-indexed, try with 'header=0'"
-                    )
-                # write to database
-                all_file.to_sql(
-                    table_name, con=self.engine, index=False, if_exists="append"
-                )
+            all_file = self.read_file(
+                indv_file, header=header, chunksize=10000, **kwargs
+            )
+            all_file.to_sql(table_name, con=self.engine, index=False, if_exists="append")
 
     def to_db_agg(
         self,
@@ -202,30 +198,13 @@ class Merger(object):
         if len(file_paths) == 0:
             raise ValueError("No files found matching '{}'".format(file_name))
         for indv_file in file_paths:
+            # NOTE will aggregate on the collapsed column name
+            tmp_file = self.read_file(indv_file, header=header, **kwargs)
             if header == 0 or header == [0]:
-                tmp_file = pd.read_csv(indv_file, header=0, **kwargs)
                 tmp_agg = utils.aggregate(tmp_file, on=by, method=method, prefix=prefix)
-                tmp_agg.to_sql(
-                    table_name, con=self.engine, index=False, if_exists="append"
-                )
             else:
-                tmp_file = pd.read_csv(indv_file, header=header, **kwargs)
-                # collapse multi-indexed columns
-                # NOTE will aggregate on the collapsed column name
-                if isinstance(tmp_file.columns, pd.core.index.MultiIndex):
-                    tmp_file.columns = colfuncs.collapse_cols(tmp_file)
-                else:
-                    # user has passed multiple header rows, but pandas doesn't
-                    # think the dataframe has multi-indexed columns so return
-                    # an error
-                    raise HeaderError(
-                        "Multiple headers selected, yet dataframe is not "
-                        + "multi-indexed, try with 'header=0'"
-                    )
                 tmp_agg = utils.aggregate(tmp_file, on=by, method=method, **kwargs)
-                tmp_agg.to_sql(
-                    table_name, con=self.engine, index=False, if_exists="append"
-                )
+            tmp_agg.to_sql(table_name, con=self.engine, index=False, if_exists="append")
 
     def to_csv_agg(
         self,
@@ -274,28 +253,87 @@ class Merger(object):
         if len(file_paths) == 0:
             raise ValueError("No files found matching '{}'".format(file_name))
         for indv_file in file_paths:
+            # NOTE will aggregate on the collapsed column name
+            tmp_file = self.read_file(indv_file, header=header, **kwargs)
             if header == 0 or header == [0]:
-                tmp_file = pd.read_csv(indv_file, header=0, **kwargs)
                 tmp_agg = utils.aggregate(tmp_file, on=by, method=method, prefix=prefix)
             else:
-                tmp_file = pd.read_csv(indv_file, header=header, **kwargs)
-                # collapse multi-indexed columns
-                # NOTE will aggregate on the collapsed column name
-                if isinstance(tmp_file.columns, pd.core.index.MultiIndex):
-                    tmp_file.columns = colfuncs.collapse_cols(tmp_file)
-                else:
-                    # user has passed multiple header rows, but pandas doesn't
-                    # think the dataframe has multi-indexed columns so return
-                    # an error
-                    raise HeaderError(
-                        "Multiple headers selected, yet dataframe is not "
-                        + "multi-indexed, try with 'header=0'"
-                    )
                 tmp_agg = utils.aggregate(tmp_file, on=by, method=method, **kwargs)
             tmp_files.append(tmp_agg)
         concat_df = pd.concat(tmp_files, copy=False)
         concat_df.to_csv(save_location, index=False)
 
+    def read_file(self, file_path, header=0, chunksize=None, **kwargs):
+        """
+        Read a single .csv file into a DataFrame, collapsing multi-indexed
+        columns if multiple header rows are given.
+
+        If the Merger was created with a `cache_dir`, then the parsed
+        DataFrame is loaded from the cache when the file hasn't changed since
+        it was last read with the same options, otherwise it is parsed and
+        stored in the cache.
+
+        Parameters:
+        -----------
+        file_path : string
+            path to the .csv file
+        header : int or list
+            the number of header rows, i.e. rows of column names.
+        chunksize : int or None (default=None)
+            if given, read the file this many rows at a time.
+        **kwargs : additional arguments to pandas.read_csv
+
+        Returns:
+        --------
+        pandas.DataFrame
+        """
+        if header == 0 or header == [0]:
+            # dont need to collapse headers
+            header = 0
+        key = None
+        if self.cache is not None:
+            # chunksize isn't part of the key, chunked and whole-file reads
+            # only differ for mixed-type columns, which can't be cached
+            key = self.cache.key(file_path, header=header, **kwargs)
+            if key is None:
+                msg = "could not cache '{}': options contain functions".format(
+                    file_path
+                )
+                warnings.warn(msg)
+            else:
+                cached = self.cache.get(key)
+                if cached is not None:
+                    return cached
+        if chunksize is None:
+            tmp_file = pd.read_csv(file_path, header=header, **kwargs)
+        else:
+            chunks = pd.read_csv(
+                file_path, header=header, chunksize=chunksize, iterator=True, **kwargs
+            )
+            tmp_file = pd.concat(chunks, ignore_index=True)
+        if header != 0:
+            # collapse multi-indexed columns
+            if isinstance(tmp_file.columns, pd.MultiIndex):
+                tmp_file.columns = colfuncs.collapse_cols(tmp_file)
+            else:
+                # user has passed multiple header rows, but pandas doesn't
+                # think the dataframe has multi-indexed columns so return
+                # an error
+                raise HeaderError(
+                    "Multiple headers selected, yet dataframe is not "
+                    + "multi-indexed, try with 'header=0'"
+                )
+        # feather files can only store string column names
+        if key is not None and all(isinstance(col, str) for col in tmp_file.columns):
+            try:
+                self.cache.put(key, tmp_file)
+            except self.cache.write_errors as err:
+                # e.g. mixed-type columns, duplicate column names or a full
+                # disk, the file is still returned, just not cached
+                msg = "could not cache '{}': {}".format(file_path, err)
+                warnings.warn(msg)
+        return tmp_file
+
     @staticmethod
     def get_table_name(select_name):
         """
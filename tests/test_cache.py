@@ -0,0 +1,132 @@
+"""
+tests for meld.cache
+"""
+
+import os
+import pandas as pd
+import pytest
+
+pytest.importorskip("pyarrow")
+
+from meld import cache
+
+
+def make_csv(tmpdir, name="DATA.csv", n_rows=10):
+    path = str(tmpdir.join(name))
+    df = pd.DataFrame({"ImageNumber": range(n_rows), "x": [1.5] * n_rows})
+    df.to_csv(path, index=False)
+    return path
+
+
+def test_key(tmpdir):
+    """meld.cache.FileCache.key(file_path, header)"""
+    path = make_csv(tmpdir)
+    key = cache.FileCache.key(path, header=0)
+    assert key == cache.FileCache.key(path, header=0)
+    assert key != cache.FileCache.key(path, header=[0, 1])
+    assert key != cache.FileCache.key(path, header=0, sep=",")
+    # modifying the file changes the key
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9))
+    assert key != cache.FileCache.key(path, header=0)
+    # functions can't be keyed consistently between sessions
+    assert cache.FileCache.key(path, converters={"x": float}) is None
+    assert cache.FileCache.key(path, date_parser=lambda x: x) is None
+
+
+def test_get_put(tmpdir):
+    """meld.cache.FileCache.get(key), meld.cache.FileCache.put(key, dataframe)"""
+    file_cache = cache.FileCache(str(tmpdir.join("cache")))
+    path = make_csv(tmpdir)
+    key = file_cache.key(path)
+    assert file_cache.get(key) is None
+    df = pd.read_csv(path)
+    file_cache.put(key, df)
+    pd.testing.assert_frame_equal(file_cache.get(key), df)
+    file_cache.clear()
+    assert file_cache.get(key) is None
+
+
+def test_evict(tmpdir):
+    """meld.cache.FileCache.evict()"""
+    cache_dir = str(tmpdir.join("cache"))
+    file_cache = cache.FileCache(cache_dir)
+    df = pd.read_csv(make_csv(tmpdir))
+    for key in ["a", "b", "c"]:
+        file_cache.put(key, df)
+    file_size = max(
+        os.path.getsize(os.path.join(cache_dir, f)) for f in os.listdir(cache_dir)
+    )
+    # use "a" so that "b" is the least recently used
+    file_cache.get("a")
+    file_cache.max_size = 2 * file_size
+    file_cache.evict()
+    assert file_cache.get("b") is None
+    assert file_cache.get("a") is not None
+    assert file_cache.get("c") is not None
+
+
+def test_evict_existing(tmpdir):
+    """meld.cache.FileCache.evict() with files from a previous session"""
+    cache_dir = str(tmpdir.join("cache"))
+    file_cache = cache.FileCache(cache_dir)
+    df = pd.read_csv(make_csv(tmpdir))
+    for key in ["a", "b", "c"]:
+        file_cache.put(key, df)
+    # make "c" the least recently used, then "a"
+    mtimes = {"c": 1, "a": 2, "b": 3}
+    for f in os.listdir(cache_dir):
+        mtime = mtimes[f.split(".")[0]]
+        os.utime(os.path.join(cache_dir, f), (mtime, mtime))
+    file_size = os.path.getsize(os.path.join(cache_dir, f))
+    file_cache = cache.FileCache(cache_dir, max_size=file_size)
+    file_cache.evict()
+    assert sorted(os.listdir(cache_dir)) == ["b.feather"]
+
+
+def test_put_failure(tmpdir):
+    """meld.cache.FileCache.put(key, dataframe) with a failed write"""
+    cache_dir = str(tmpdir.join("cache"))
+    file_cache = cache.FileCache(cache_dir)
+    df = pd.DataFrame({"a": [1, "x"]})
+    with pytest.raises(file_cache.write_errors):
+        file_cache.put("a", df)
+    assert os.listdir(cache_dir) == []
+    assert file_cache.get("a") is None
+
+
+def test_get_corrupt(tmpdir):
+    """meld.cache.FileCache.get(key) with an unreadable cached file"""
+    cache_dir = str(tmpdir.join("cache"))
+    file_cache = cache.FileCache(cache_dir)
+    file_cache.put("a", pd.read_csv(make_csv(tmpdir)))
+    for f in os.listdir(cache_dir):
+        with open(os.path.join(cache_dir, f), "w") as handle:
+            handle.write("not a feather file")
+    assert file_cache.get("a") is None
+    assert os.listdir(cache_dir) == []
+    assert file_cache._size == 0
+
+
+def test_put_too_large(tmpdir):
+    """meld.cache.FileCache.put(key, dataframe) larger than max_size"""
+    cache_dir = str(tmpdir.join("cache"))
+    file_cache = cache.FileCache(cache_dir, max_size=10)
+    file_cache.put("a", pd.read_csv(make_csv(tmpdir)))
+    assert os.listdir(cache_dir) == []
+
+
+def test_evict_shared(tmpdir):
+    """meld.cache.FileCache.evict() with a cache directory shared by processes"""
+    cache_dir = str(tmpdir.join("cache"))
+    df = pd.read_csv(make_csv(tmpdir))
+    other_cache = cache.FileCache(cache_dir)
+    file_cache = cache.FileCache(cache_dir)
+    other_cache.put("a", df)
+    other_cache.put("b", df)
+    file_size = os.path.getsize(os.path.join(cache_dir, os.listdir(cache_dir)[0]))
+    file_cache.max_size = 2 * file_size
+    file_cache.rescan_every = 1
+    file_cache.put("c", df)
+    assert len(os.listdir(cache_dir)) == 2
+    assert file_cache.get("c") is not None
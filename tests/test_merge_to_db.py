@@ -2,6 +2,17 @@
 tests for meld.merge_to_db
 """
 
+import os
+import shutil
+import warnings
+import pandas as pd
+import pytest
+import meld.merge_to_db
+
+CURRENT_PATH = os.path.dirname(__file__)
+TEST_DIR = os.path.join(CURRENT_PATH, "test_data")
+TEST_PATH = os.path.join(TEST_DIR, "test_run0/DATA.csv")
+
 
 def test_create_db():
     """meld.merge_to_db.Merger.create_db(location, db_name)"""
@@ -18,3 +29,117 @@ def test_to_db():
 def test_to_db_agg():
     """meld.merge_to_db.Merger.to_db_agg(select, header, by, method, prefix)"""
     assert False
+
+
+def test_read_file():
+    """meld.merge_to_db.Merger.read_file(file_path, header)"""
+    merger = meld.merge_to_db.Merger(TEST_DIR)
+    assert merger.cache is None
+    df = merger.read_file(TEST_PATH, header=[0, 1])
+    assert df.columns[0] == "Image_ImageNumber"
+    assert df.shape[0] == pd.read_csv(TEST_PATH, header=[0, 1]).shape[0]
+    # chunked reading gives the same result
+    df_chunked = merger.read_file(TEST_PATH, header=[0, 1], chunksize=2)
+    pd.testing.assert_frame_equal(df, df_chunked)
+    # multiple headers which aren't multi-indexed
+    with pytest.raises(meld.merge_to_db.HeaderError):
+        merger.read_file(TEST_PATH, header=1)
+
+
+def test_read_file_cache(tmpdir):
+    """meld.merge_to_db.Merger.read_file(file_path, header) with a cache"""
+    pytest.importorskip("pyarrow")
+    data_dir = str(tmpdir.join("data"))
+    shutil.copytree(TEST_DIR, data_dir)
+    cache_dir = str(tmpdir.join("cache"))
+    merger = meld.merge_to_db.Merger(data_dir, cache_dir=cache_dir)
+    assert merger.cache is not None
+    data_path = os.path.join(data_dir, "test_run0", "DATA.csv")
+    df = merger.read_file(data_path, header=[0, 1])
+    key = merger.cache.key(data_path, header=[0, 1])
+    cached = merger.cache.get(key)
+    pd.testing.assert_frame_equal(cached, df)
+    # cache hit gives the same result as a fresh parse
+    fresh = meld.merge_to_db.Merger(data_dir).read_file(data_path, header=[0, 1])
+    pd.testing.assert_frame_equal(merger.read_file(data_path, header=[0, 1]), fresh)
+    # modifying the source file misses the cache
+    with open(data_path) as f:
+        contents = f.read().rstrip("\n")
+    with open(data_path, "w") as f:
+        f.write(contents + "\n99,0.1,10,0.5,2,0.2,A01\n")
+    df_modified = merger.read_file(data_path, header=[0, 1])
+    assert df_modified.shape[0] == df.shape[0] + 1
+    # chunked reads and equivalent headers share a cache entry
+    n_cached = len(os.listdir(cache_dir))
+    merger.read_file(data_path, header=[0, 1], chunksize=2)
+    merger.read_file(data_path, header=0)
+    merger.read_file(data_path, header=[0], chunksize=2)
+    assert len(os.listdir(cache_dir)) == n_cached + 1
+    # HeaderError is still raised with a cache
+    with pytest.raises(meld.merge_to_db.HeaderError):
+        merger.read_file(data_path, header=1)
+
+
+def test_read_file_cache_skip(tmpdir):
+    """meld.merge_to_db.Merger.read_file() with data that can't be cached"""
+    pytest.importorskip("pyarrow")
+    cache_dir = str(tmpdir.join("cache"))
+    merger = meld.merge_to_db.Merger(TEST_DIR, cache_dir=cache_dir)
+    # non-string column names are not cached
+    names = list(range(7))
+    df = merger.read_file(TEST_PATH, header=0, names=names, skiprows=[1])
+    assert df.columns.tolist() == names
+    assert os.listdir(cache_dir) == []
+    # collapsed column names can collide, duplicate column names can't be
+    # written to the cache but the data is still returned
+    dup_path = str(tmpdir.join("DUP.csv"))
+    with open(dup_path, "w") as f:
+        f.write("a_b,a\nc,b_c\n1,2\n")
+    with warnings.catch_warnings(record=True) as caught:
+        warnings.simplefilter("always")
+        df = merger.read_file(dup_path, header=[0, 1])
+    assert df.columns.tolist() == ["a_b_c", "a_b_c"]
+    assert any("could not cache" in str(w.message) for w in caught)
+    assert os.listdir(cache_dir) == []
+
+
+def test_read_file_cache_errors(tmpdir, monkeypatch):
+    """meld.merge_to_db.Merger.read_file() with cache read and write errors"""
+    pytest.importorskip("pyarrow")
+    cache_dir = str(tmpdir.join("cache"))
+    merger = meld.merge_to_db.Merger(TEST_DIR, cache_dir=cache_dir)
+    expected = merger.read_file(TEST_PATH, header=[0, 1])
+    # unreadable cached files are parsed again
+    for f in os.listdir(cache_dir):
+        with open(os.path.join(cache_dir, f), "w") as handle:
+            handle.write("not a feather file")
+    df = merger.read_file(TEST_PATH, header=[0, 1])
+    pd.testing.assert_frame_equal(df, expected)
+    merger.cache.clear()
+
+    # I/O errors when writing to the cache don't stop the read
+    def write_feather(*args, **kwargs):
+        raise OSError(28, "No space left on device")
+
+    monkeypatch.setattr(merger.cache._feather, "write_feather", write_feather)
+    with warnings.catch_warnings(record=True) as caught:
+        warnings.simplefilter("always")
+        df = merger.read_file(TEST_PATH, header=[0, 1])
+    pd.testing.assert_frame_equal(df, expected)
+    assert any("No space left" in str(w.message) for w in caught)
+    assert os.listdir(cache_dir) == []
+
+
+def test_read_file_cache_functions(tmpdir):
+    """meld.merge_to_db.Merger.read_file() with functions as read_csv options"""
+    pytest.importorskip("pyarrow")
+    cache_dir = str(tmpdir.join("cache"))
+    merger = meld.merge_to_db.Merger(TEST_DIR, cache_dir=cache_dir)
+    with warnings.catch_warnings(record=True) as caught:
+        warnings.simplefilter("always")
+        df = merger.read_file(
+            TEST_PATH, header=[0, 1], converters={("Cell", "Area"): float}
+        )
+    assert df["Cell_Area"].dtype == float
+    assert any("options contain functions" in str(w.message) for w in caught)
+    assert os.listdir(cache_dir) == []